@@ -10,8 +10,10 @@ for more details about the presubmit API built into gcl.
 """
 
 import collections
+import concurrent.futures
 import csv
 import fnmatch
+import functools
 import os
 import re
 import subprocess
@@ -34,6 +36,16 @@ PUBLIC_API_OWNERS = (
     'reed@google.com',
 )
 
+# Extensions of the files covered by the source-file style checks. Kept as a
+# tuple so a single C-level str.endswith call classifies a path.
+SOURCE_FILE_EXTENSIONS = (
+    '.h', '.py', '.sh', '.m', '.mm', '.go', '.c', '.cc', '.cpp')
+
+# Top-level directory prefixes, precomputed so classifying a path is a single
+# startswith call instead of a split that allocates a list.
+_INCLUDE_PREFIX = 'include' + os.path.sep
+_SITE_PREFIX = 'site' + os.path.sep
+
 AUTHORS_FILE_NAME = 'AUTHORS'
 RELEASE_NOTES_FILE_NAME = 'RELEASE_NOTES.txt'
 
@@ -42,39 +54,143 @@ DOCS_INDEX = '_index'
 
 GOLD_TRYBOT_URL = 'https://gold.skia.org/search?issue='
 
-SERVICE_ACCOUNT_SUFFIX = [
+SERVICE_ACCOUNT_SUFFIX = tuple(
     '@%s.iam.gserviceaccount.com' % project for project in [
         'skia-buildbots.google.com', 'skia-swarming-bots', 'skia-public',
-        'skia-corp.google.com', 'chops-service-accounts']]
+        'skia-corp.google.com', 'chops-service-accounts'])
+
+# Compile the patterns used by the checks below once at import time instead of
+# rebuilding them on every invocation.
+# Matches a whole line that is blank or contains only a comment (the start,
+# middle or end of a block comment, or a single-line comment), so that
+# everything above the first real line of a file can be stripped in one pass.
+_COMMENT_OR_EMPTY_LINE_RE = re.compile(
+    rb'^(?:\s*(?:/\*.*|//.*)?|\s+\*.*)\n', re.M)
+_COPYRIGHT_RE = re.compile(
+    rb'Copyright (\([cC]\) )?\d{4}(-\d{4})?(,\d{4}(-\d{4})?)*,? \w+')
+_CONFLICT_RE = re.compile(rb'^(?:<<<<<<<|>>>>>>>) |^=======$', re.M)
+_AUTHORS_EMAIL_RE = re.compile(r'<(.*)>')
+_AUTHORS_COMMENT_LINE_RE = re.compile(r'^#.*\n?', re.M)
+_TBR_RE = re.compile(r'^TBR=(.*)$', re.M)
+_REVERT_RE = re.compile(REVERT_CL_SUBJECT_PREFIX, re.I)
+
+
+# Files larger than this are read on demand rather than kept in the shared
+# per-run content cache.
+_FILE_CACHE_MAX_SIZE = 1 * 1024 * 1024
+
+
+def _ReadAffectedFile(input_api, affected_file):
+  """Returns the bytes of an affected file, reading it at most once per run.
+
+  The cache lives on input_api so that every check in the same presubmit run
+  shares a single read of each file.
+  """
+  cache = getattr(input_api, '_skia_file_contents_cache', None)
+  if cache is None:
+    cache = {}
+    input_api._skia_file_contents_cache = cache
+  path = affected_file.LocalPath()
+  contents = cache.get(path)
+  if contents is None:
+    with open(path, 'rb') as f:
+      contents = f.read()
+    if len(contents) <= _FILE_CACHE_MAX_SIZE:
+      cache[path] = contents
+  return contents
+
+
+def _AffectedFiles(input_api, include_deletes=True):
+  """Returns the change's affected files, querying the SCM only once per run.
+
+  The materialized list lives on input_api, like the file-content cache, so
+  every check shares a single SCM walk.
+  """
+  cached = getattr(input_api, '_skia_affected_files_cache', None)
+  if cached is None:
+    cached = list(input_api.AffectedFiles())
+    input_api._skia_affected_files_cache = cached
+  if include_deletes:
+    return cached
+  return [f for f in cached if f.Action() != 'D']
+
 
+_ChangeFlags = collections.namedtuple(
+    '_ChangeFlags', ['sources', 'cxx_sources', 'json', 'gn', 'deps', 'infra'])
 
-def _CheckChangeHasEol(input_api, output_api, source_file_filter=None):
-  """Checks that files end with at least one \n (LF)."""
+
+def _ClassifyAffectedFiles(input_api):
+  """Classifies the change's files in a single pass.
+
+  Each check gates on its flag, so a change that touches none of the files a
+  check cares about skips that check without walking the change again.
+  """
+  cached = getattr(input_api, '_skia_change_flags_cache', None)
+  if cached is not None:
+    return cached
+  sources = cxx_sources = json_files = gn = deps = infra = False
+  deps_files = ('DEPS', os.path.join('infra', 'bots', 'check_deps.py'))
+  for f in _AffectedFiles(input_api):
+    path = f.LocalPath()
+    if path.endswith(SOURCE_FILE_EXTENSIONS):
+      sources = True
+    if path.endswith(('.cpp', '.h')):
+      cxx_sources = True
+    if (path.endswith('.json') or
+        (path.startswith(_SITE_PREFIX) and
+         path.endswith(os.path.sep + 'METADATA'))):
+      json_files = True
+    if path.endswith(('.gn', '.gni')):
+      gn = True
+    if path in deps_files:
+      deps = True
+    if path.startswith('infra'):
+      infra = True
+  cached = _ChangeFlags(sources, cxx_sources, json_files, gn, deps, infra)
+  input_api._skia_change_flags_cache = cached
+  return cached
+
+
+def _SourceFileChecks(input_api, output_api, source_file_filter=None):
+  """Single-pass checks over each affected source file's contents.
+
+  Fuses the trailing-newline and copyright-header checks, so each file's
+  cached bytes are fetched and examined once instead of once per check.
+  """
+  results = []
+  if not _ClassifyAffectedFiles(input_api).sources:
+    return results
   eof_files = []
-  for f in input_api.AffectedSourceFiles(source_file_filter):
-    contents = input_api.ReadFile(f, 'rb')
+  for affected_file in input_api.AffectedSourceFiles(source_file_filter):
+    path = affected_file.LocalPath()
+    contents = _ReadAffectedFile(input_api, affected_file)
     # Check that the file ends in at least one newline character.
-    if len(contents) > 1 and contents[-1:] != '\n':
-      eof_files.append(f.LocalPath())
+    if len(contents) > 1 and contents[-1:] != b'\n':
+      eof_files.append(path)
+    if ('third_party/' not in path and 'tests/sksl/' not in path and
+        not _COPYRIGHT_RE.search(contents)):
+      results.append(output_api.PresubmitError(
+          '%s is missing a correct copyright header.' % affected_file))
 
   if eof_files:
-    return [output_api.PresubmitPromptWarning(
+    results.append(output_api.PresubmitPromptWarning(
       'These files should end in a newline character:',
-      items=eof_files)]
-  return []
+      items=eof_files))
+  return results
 
 
 def _JsonChecks(input_api, output_api):
   """Run checks on any modified json files."""
+  if not _ClassifyAffectedFiles(input_api).json:
+    return []
   failing_files = []
-  for affected_file in input_api.AffectedFiles(None):
+  for affected_file in _AffectedFiles(input_api, include_deletes=False):
     affected_file_path = affected_file.LocalPath()
-    is_json = affected_file_path.endswith('.json')
-    is_metadata = (affected_file_path.startswith('site/') and
-                   affected_file_path.endswith('/METADATA'))
-    if is_json or is_metadata:
+    if (affected_file_path.endswith('.json') or
+        (affected_file_path.startswith(_SITE_PREFIX) and
+         affected_file_path.endswith(os.path.sep + 'METADATA'))):
       try:
-        input_api.json.load(open(affected_file_path, 'r'))
+        input_api.json.loads(_ReadAffectedFile(input_api, affected_file))
       except ValueError:
         failing_files.append(affected_file_path)
 
@@ -89,34 +205,20 @@ def _JsonChecks(input_api, output_api):
 
 def _IfDefChecks(input_api, output_api):
   """Ensures if/ifdef are not before includes. See skbug/3362 for details."""
-  comment_block_start_pattern = re.compile('^\s*\/\*.*$')
-  comment_block_middle_pattern = re.compile('^\s+\*.*')
-  comment_block_end_pattern = re.compile('^\s+\*\/.*$')
-  single_line_comment_pattern = re.compile('^\s*//.*$')
-  def is_comment(line):
-    return (comment_block_start_pattern.match(line) or
-            comment_block_middle_pattern.match(line) or
-            comment_block_end_pattern.match(line) or
-            single_line_comment_pattern.match(line))
-
-  empty_line_pattern = re.compile('^\s*$')
-  def is_empty_line(line):
-    return empty_line_pattern.match(line)
-
+  if not _ClassifyAffectedFiles(input_api).cxx_sources:
+    return []
   failing_files = []
   for affected_file in input_api.AffectedSourceFiles(None):
     affected_file_path = affected_file.LocalPath()
-    if affected_file_path.endswith('.cpp') or affected_file_path.endswith('.h'):
-      f = open(affected_file_path)
-      for line in f.xreadlines():
-        if is_comment(line) or is_empty_line(line):
-          continue
-        # The below will be the first real line after comments and newlines.
-        if line.startswith('#if 0 '):
-          pass
-        elif line.startswith('#if ') or line.startswith('#ifdef '):
-          failing_files.append(affected_file_path)
-        break
+    if affected_file_path.endswith(('.cpp', '.h')):
+      contents = _ReadAffectedFile(input_api, affected_file)
+      # Strip comments and blank lines in a single C-level pass; the stripped
+      # buffer then starts at the first real line of the file.
+      stripped = _COMMENT_OR_EMPTY_LINE_RE.sub(b'', contents)
+      if stripped.startswith(b'#if 0 '):
+        pass
+      elif stripped.startswith((b'#if ', b'#ifdef ')):
+        failing_files.append(affected_file_path)
 
   results = []
   if failing_files:
@@ -128,30 +230,10 @@ def _IfDefChecks(input_api, output_api):
   return results
 
 
-def _CopyrightChecks(input_api, output_api, source_file_filter=None):
-  results = []
-  year_pattern = r'\d{4}'
-  year_range_pattern = r'%s(-%s)?' % (year_pattern, year_pattern)
-  years_pattern = r'%s(,%s)*,?' % (year_range_pattern, year_range_pattern)
-  copyright_pattern = (
-      r'Copyright (\([cC]\) )?%s \w+' % years_pattern)
-
-  for affected_file in input_api.AffectedSourceFiles(source_file_filter):
-    if ('third_party/' in affected_file.LocalPath() or
-        'tests/sksl/' in affected_file.LocalPath()):
-      continue
-    contents = input_api.ReadFile(affected_file, 'rb')
-    if not re.search(copyright_pattern, contents):
-      results.append(output_api.PresubmitError(
-          '%s is missing a correct copyright header.' % affected_file))
-  return results
-
-
 def _InfraTests(input_api, output_api):
   """Run the infra tests."""
   results = []
-  if not any(f.LocalPath().startswith('infra')
-             for f in input_api.AffectedFiles()):
+  if not _ClassifyAffectedFiles(input_api).infra:
     return results
 
   cmd = ['python', os.path.join('infra', 'bots', 'infra_tests.py')]
@@ -165,10 +247,11 @@ def _InfraTests(input_api, output_api):
 
 def _CheckGNFormatted(input_api, output_api):
   """Make sure any .gn files we're changing have been formatted."""
+  if not _ClassifyAffectedFiles(input_api).gn:
+    return []
   files = []
-  for f in input_api.AffectedFiles(include_deletes=False):
-    if (f.LocalPath().endswith('.gn') or
-        f.LocalPath().endswith('.gni')):
+  for f in _AffectedFiles(input_api, include_deletes=False):
+    if f.LocalPath().endswith(('.gn', '.gni')):
       files.append(f)
   if not files:
     return []
@@ -180,40 +263,65 @@ def _CheckGNFormatted(input_api, output_api):
     return [output_api.PresubmitError(
         '`%s` failed:\n%s' % (' '.join(cmd), e.output))]
 
+  gn = 'gn.exe' if 'win32' in sys.platform else 'gn'
+  gn = os.path.join(input_api.PresubmitLocalPath(), 'bin', gn)
+  paths = [f.LocalPath() for f in files]
+
+  # Check all the files with a single gn invocation; gn's startup cost is paid
+  # once instead of once per file. Only when that fails do we rerun per file to
+  # attribute the failures.
+  try:
+    subprocess.check_output([gn, 'format', '--dry-run'] + paths)
+    return []
+  except subprocess.CalledProcessError:
+    pass
+
   results = []
-  for f in files:
-    gn = 'gn.exe' if 'win32' in sys.platform else 'gn'
-    gn = os.path.join(input_api.PresubmitLocalPath(), 'bin', gn)
-    cmd = [gn, 'format', '--dry-run', f.LocalPath()]
+  for path in paths:
+    cmd = [gn, 'format', '--dry-run', path]
     try:
       subprocess.check_output(cmd)
     except subprocess.CalledProcessError:
-      fix = 'bin/gn format ' + f.LocalPath()
+      fix = 'bin/gn format ' + path
       results.append(output_api.PresubmitError(
           '`%s` failed, try\n\t%s' % (' '.join(cmd), fix)))
   return results
 
 
 def _CheckGitConflictMarkers(input_api, output_api):
-  pattern = input_api.re.compile('^(?:<<<<<<<|>>>>>>>) |^=======$')
   results = []
-  for f in input_api.AffectedFiles():
-    for line_num, line in f.ChangedContents():
-      if f.LocalPath().endswith('.md'):
-        # First-level headers in markdown look a lot like version control
-        # conflict markers. http://daringfireball.net/projects/markdown/basics
-        continue
-      if pattern.match(line):
-        results.append(
-            output_api.PresubmitError(
-                'Git conflict markers found in %s:%d %s' % (
-                    f.LocalPath(), line_num, line)))
+  for f in _AffectedFiles(input_api):
+    if f.LocalPath().endswith('.md'):
+      # First-level headers in markdown look a lot like version control
+      # conflict markers. http://daringfireball.net/projects/markdown/basics
+      continue
+    if f.Action() == 'D':
+      continue
+    # Prescreen the whole buffer with C-level substring searches; only files
+    # that contain a marker token at all are worth the per-line scan.
+    contents = _ReadAffectedFile(input_api, f)
+    if (b'<<<<<<<' not in contents and b'=======' not in contents and
+        b'>>>>>>>' not in contents):
+      continue
+    # Scan the bytes directly: the markers are pure ASCII, so there is no need
+    # to decode every line just to look for them. Line numbers come from one
+    # newline count per (rare) match.
+    for match in _CONFLICT_RE.finditer(contents):
+      line_num = contents.count(b'\n', 0, match.start()) + 1
+      line_end = contents.find(b'\n', match.start())
+      if line_end == -1:
+        line_end = len(contents)
+      line = contents[match.start():line_end].decode('utf-8', 'replace')
+      results.append(
+          output_api.PresubmitError(
+              'Git conflict markers found in %s:%d %s' % (
+                  f.LocalPath(), line_num, line)))
   return results
 
 
 def _CheckIncludesFormatted(input_api, output_api):
   """Make sure #includes in files we're changing have been formatted."""
-  files = [str(f) for f in input_api.AffectedFiles() if f.Action() != 'D']
+  files = [str(f) for f in _AffectedFiles(input_api, include_deletes=False)]
   cmd = ['python',
          'tools/rewrite_includes.py',
          '--dry-run'] + files
@@ -222,29 +330,38 @@ def _CheckIncludesFormatted(input_api, output_api):
   return []
 
 
-class _WarningsAsErrors():
-  def __init__(self, output_api):
-    self.output_api = output_api
-    self.old_warning = None
-  def __enter__(self):
-    self.old_warning = self.output_api.PresubmitPromptWarning
-    self.output_api.PresubmitPromptWarning = self.output_api.PresubmitError
-    return self.output_api
-  def __exit__(self, ex_type, ex_value, ex_traceback):
-    self.output_api.PresubmitPromptWarning = self.old_warning
+def _UpgradeWarningsToErrors(output_api, results):
+  """Returns the results with any prompt warnings upgraded to errors.
+
+  Post-processing the results replaces the old _WarningsAsErrors context
+  manager, which patched output_api in place and therefore could not run while
+  other checks share it on the thread pool.
+  """
+  upgraded = []
+  for result in results:
+    if isinstance(result, output_api.PresubmitPromptWarning):
+      fields = result.json_format()
+      result = output_api.PresubmitError(
+          fields['message'],
+          items=fields['items'],
+          long_text=fields['long_text'])
+    upgraded.append(result)
+  return upgraded
+
+
+def _CannedCheckAsErrors(canned_check, sources, input_api, output_api):
+  """Runs a canned source-file check, treating its warnings as errors."""
+  return _UpgradeWarningsToErrors(
+      output_api,
+      canned_check(input_api, output_api, source_file_filter=sources))
 
 
 def _CheckDEPSValid(input_api, output_api):
   """Ensure that DEPS contains valid entries."""
   results = []
-  script = os.path.join('infra', 'bots', 'check_deps.py')
-  relevant_files = ('DEPS', script)
-  for f in input_api.AffectedFiles():
-    if f.LocalPath() in relevant_files:
-      break
-  else:
+  if not _ClassifyAffectedFiles(input_api).deps:
     return results
-  cmd = ['python', script]
+  cmd = ['python', os.path.join('infra', 'bots', 'check_deps.py')]
   try:
     subprocess.check_output(cmd, stderr=subprocess.STDOUT)
   except subprocess.CalledProcessError as e:
@@ -252,36 +369,44 @@ def _CheckDEPSValid(input_api, output_api):
   return results
 
 
-def _CommonChecks(input_api, output_api):
-  """Presubmit checks common to upload and commit."""
+def _RunChecksInParallel(checks, input_api, output_api):
+  """Runs independent checks concurrently and returns their combined results.
+
+  The checks are IO-bound (file reads and subprocess waits), so a thread pool
+  lets their IO overlap. Results are collected in the order the checks were
+  given.
+  """
   results = []
-  sources = lambda x: (x.LocalPath().endswith('.h') or
-                       x.LocalPath().endswith('.py') or
-                       x.LocalPath().endswith('.sh') or
-                       x.LocalPath().endswith('.m') or
-                       x.LocalPath().endswith('.mm') or
-                       x.LocalPath().endswith('.go') or
-                       x.LocalPath().endswith('.c') or
-                       x.LocalPath().endswith('.cc') or
-                       x.LocalPath().endswith('.cpp'))
-  results.extend(_CheckChangeHasEol(
-      input_api, output_api, source_file_filter=sources))
-  with _WarningsAsErrors(output_api):
-    results.extend(input_api.canned_checks.CheckChangeHasNoCR(
-        input_api, output_api, source_file_filter=sources))
-    results.extend(input_api.canned_checks.CheckChangeHasNoStrayWhitespace(
-        input_api, output_api, source_file_filter=sources))
-  results.extend(_JsonChecks(input_api, output_api))
-  results.extend(_IfDefChecks(input_api, output_api))
-  results.extend(_CopyrightChecks(input_api, output_api,
-                                  source_file_filter=sources))
-  results.extend(_CheckDEPSValid(input_api, output_api))
-  results.extend(_CheckIncludesFormatted(input_api, output_api))
-  results.extend(_CheckGNFormatted(input_api, output_api))
-  results.extend(_CheckGitConflictMarkers(input_api, output_api))
+  max_workers = min(8, os.cpu_count() or 1)
+  with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+    futures = [pool.submit(check, input_api, output_api) for check in checks]
+    for future in futures:
+      results.extend(future.result())
   return results
 
 
+def _CommonChecks(input_api, output_api):
+  """Presubmit checks common to upload and commit."""
+  sources = lambda x: x.LocalPath().endswith(SOURCE_FILE_EXTENSIONS)
+  checks = [
+      functools.partial(_SourceFileChecks, source_file_filter=sources),
+      _JsonChecks,
+      _IfDefChecks,
+      _CheckDEPSValid,
+      _CheckIncludesFormatted,
+      _CheckGNFormatted,
+      _CheckGitConflictMarkers,
+      # These canned checks report prompt warnings; we treat those as errors.
+      functools.partial(_CannedCheckAsErrors,
+                        input_api.canned_checks.CheckChangeHasNoCR,
+                        sources),
+      functools.partial(_CannedCheckAsErrors,
+                        input_api.canned_checks.CheckChangeHasNoStrayWhitespace,
+                        sources),
+  ]
+  return _RunChecksInParallel(checks, input_api, output_api)
+
+
 def CheckChangeOnUpload(input_api, output_api):
   """Presubmit checks for the change on upload."""
   results = []
@@ -294,34 +419,68 @@ def CheckChangeOnUpload(input_api, output_api):
 
 
 class CodeReview(object):
-  """Abstracts which codereview tool is used for the specified issue."""
+  """Abstracts which codereview tool is used for the specified issue.
+
+  Each gerrit response is fetched lazily and cached on the instance, so a
+  presubmit run pays for at most one RPC per kind of data no matter how many
+  checks consult it.
+  """
 
   def __init__(self, input_api):
     self._issue = input_api.change.issue
     self._gerrit = input_api.gerrit
+    self._change_info = None
+    self._owner_email = None
+    self._description = None
+
+  def _GetChangeInfo(self):
+    if self._change_info is None:
+      self._change_info = self._gerrit.GetChangeInfo(self._issue)
+    return self._change_info
 
   def GetOwnerEmail(self):
-    return self._gerrit.GetChangeOwner(self._issue)
+    if self._owner_email is None:
+      self._owner_email = self._gerrit.GetChangeOwner(self._issue)
+    return self._owner_email
 
   def GetSubject(self):
-    return self._gerrit.GetChangeInfo(self._issue)['subject']
+    return self._GetChangeInfo()['subject']
 
   def GetDescription(self):
-    return self._gerrit.GetChangeDescription(self._issue)
+    if self._description is None:
+      self._description = self._gerrit.GetChangeDescription(self._issue)
+    return self._description
 
   def GetReviewers(self):
-    code_review_label = (
-        self._gerrit.GetChangeInfo(self._issue)['labels']['Code-Review'])
+    code_review_label = self._GetChangeInfo()['labels']['Code-Review']
     return [r['email'] for r in code_review_label.get('all', [])]
 
   def GetApprovers(self):
-    approvers = []
-    code_review_label = (
-        self._gerrit.GetChangeInfo(self._issue)['labels']['Code-Review'])
-    for m in code_review_label.get('all', []):
-      if m.get("value") == 1:
-        approvers.append(m["email"])
-    return approvers
+    code_review_label = self._GetChangeInfo()['labels']['Code-Review']
+    return [m['email'] for m in code_review_label.get('all', [])
+            if m.get('value') == 1]
+
+
+@functools.lru_cache(maxsize=4)
+def _LoadAuthorsRegex(path, mtime):
+  """Parses an AUTHORS file into one compiled regex over its email globs.
+
+  Keyed by (path, mtime) so the parse is reused across presubmit invocations
+  in the same process and invalidated automatically when the file changes.
+  Returns None if the file lists no emails.
+  """
+  del mtime  # Only part of the cache key.
+  with open(path) as f:
+    authors_content = _AUTHORS_COMMENT_LINE_RE.sub('', f.read())
+  email_fnmatches = _AUTHORS_EMAIL_RE.findall(authors_content)
+  if not email_fnmatches:
+    return None
+  # Translating each fnmatch pattern once and folding them into a single
+  # alternation makes the membership test one regex match instead of one
+  # fnmatch call (and a fresh translation) per AUTHORS entry.
+  normcase = os.path.normcase
+  return re.compile('|'.join(
+      '(?:%s)' % fnmatch.translate(normcase(p)) for p in email_fnmatches))
 
 
 def _CheckOwnerIsInAuthorsFile(input_api, output_api):
@@ -332,22 +491,16 @@ def _CheckOwnerIsInAuthorsFile(input_api, output_api):
     owner_email = cr.GetOwnerEmail()
 
     # Service accounts don't need to be in AUTHORS.
-    for suffix in SERVICE_ACCOUNT_SUFFIX:
-      if owner_email.endswith(suffix):
-        return results
+    if owner_email.endswith(SERVICE_ACCOUNT_SUFFIX):
+      return results
 
     try:
-      authors_content = ''
-      for line in open(AUTHORS_FILE_NAME):
-        if not line.startswith('#'):
-          authors_content += line
-      email_fnmatches = re.findall('<(.*)>', authors_content)
-      for email_fnmatch in email_fnmatches:
-        if fnmatch.fnmatch(owner_email, email_fnmatch):
-          # Found a match, the user is in the AUTHORS file break out of the loop
-          break
-      else:
-        results.append(
+      authors_re = _LoadAuthorsRegex(
+          AUTHORS_FILE_NAME, os.path.getmtime(AUTHORS_FILE_NAME))
+      if authors_re and authors_re.match(os.path.normcase(owner_email)):
+        # The owner is in the AUTHORS file.
+        return results
+      results.append(
           output_api.PresubmitError(
             'The email %s is not in Skia\'s AUTHORS file.\n'
             'Issue owner, this CL must include an addition to the Skia AUTHORS '
@@ -361,22 +514,23 @@ def _CheckOwnerIsInAuthorsFile(input_api, output_api):
   return results
 
 
+def _IsPublicApiHeader(path):
+  """Whether the path is a header under the top-level include dir.
+
+  We only care about files that end in .h and are under the top-level include
+  dir, but not include/private.
+  """
+  return (path.endswith('.h') and
+          path.startswith(_INCLUDE_PREFIX) and
+          'private' not in path)
+
+
 def _CheckReleaseNotesForPublicAPI(input_api, output_api):
   """Checks to see if release notes file is updated with public API changes."""
   results = []
-  public_api_changed = False
-  release_file_changed = False
-  for affected_file in input_api.AffectedFiles():
-    affected_file_path = affected_file.LocalPath()
-    file_path, file_ext = os.path.splitext(affected_file_path)
-    # We only care about files that end in .h and are under the top-level
-    # include dir, but not include/private.
-    if (file_ext == '.h' and
-        file_path.split(os.path.sep)[0] == 'include' and
-        'private' not in file_path):
-      public_api_changed = True
-    elif affected_file_path == RELEASE_NOTES_FILE_NAME:
-      release_file_changed = True
+  affected_paths = [f.LocalPath() for f in _AffectedFiles(input_api)]
+  public_api_changed = any(_IsPublicApiHeader(p) for p in affected_paths)
+  release_file_changed = RELEASE_NOTES_FILE_NAME in affected_paths
 
   if public_api_changed and not release_file_changed:
     results.append(output_api.PresubmitPromptWarning(
@@ -393,25 +547,15 @@ def _CheckLGTMsForPublicAPI(input_api, output_api):
   PUBLIC_API_OWNERS.
   """
   results = []
-  requires_owner_check = False
-  for affected_file in input_api.AffectedFiles():
-    affected_file_path = affected_file.LocalPath()
-    file_path, file_ext = os.path.splitext(affected_file_path)
-    # We only care about files that end in .h and are under the top-level
-    # include dir, but not include/private.
-    if (file_ext == '.h' and
-        'include' == file_path.split(os.path.sep)[0] and
-        'private' not in file_path):
-      requires_owner_check = True
-
-  if not requires_owner_check:
+  if not any(_IsPublicApiHeader(f.LocalPath())
+             for f in _AffectedFiles(input_api)):
     return results
 
   lgtm_from_owner = False
   if input_api.change.issue:
     cr = CodeReview(input_api)
 
-    if re.match(REVERT_CL_SUBJECT_PREFIX, cr.GetSubject(), re.I):
+    if _REVERT_RE.match(cr.GetSubject()):
       # It is a revert CL, ignore the public api owners check.
       return results
 
@@ -422,7 +566,7 @@ def _CheckLGTMsForPublicAPI(input_api, output_api):
           # public api owners check.
           return results
     else:
-      match = re.search(r'^TBR=(.*)$', cr.GetDescription(), re.M)
+      match = _TBR_RE.search(cr.GetDescription())
       if match:
         tbr_section = match.group(1).strip().split(' ')[0]
         tbr_entries = tbr_section.split(',')
@@ -467,25 +611,22 @@ def PostUploadHook(gerrit, change, output_api):
   # Skip PostUploadHooks for all auto-commit service account bots. New
   # patchsets (caused due to PostUploadHooks) invalidates the CQ+2 vote from
   # the "--use-commit-queue" flag to "git cl upload".
-  for suffix in SERVICE_ACCOUNT_SUFFIX:
-    if change.author_email.endswith(suffix):
-      return []
+  if change.author_email.endswith(SERVICE_ACCOUNT_SUFFIX):
+    return []
 
   results = []
   all_docs_changes = True
-  docs_preview_links = []
+  docs_preview_links = set()
   for affected_file in change.AffectedFiles():
     affected_file_path = affected_file.LocalPath()
     file_path, _ = os.path.splitext(affected_file_path)
-    top_level_dir = file_path.split(os.path.sep)[0]
-    if 'site' == top_level_dir:
-      site_path = os.path.sep.join(file_path.split(os.path.sep)[1:])
+    if file_path.startswith(_SITE_PREFIX):
+      site_path = file_path[len(_SITE_PREFIX):]
       # Strip DOCS_INDEX from the site_path to construct the docs_preview_link.
       if site_path.endswith(DOCS_INDEX):
         site_path = site_path[:-len(DOCS_INDEX)]
-      docs_preview_link = DOCS_PREVIEW_URL_TMPL.format(
-          path=site_path, issue=change.issue)
-      docs_preview_links.append(docs_preview_link)
+      docs_preview_links.add(DOCS_PREVIEW_URL_TMPL.format(
+          path=site_path, issue=change.issue))
     else:
       all_docs_changes = False
 
@@ -503,12 +644,13 @@ def PostUploadHook(gerrit, change, output_api):
             '\'No-Try: true\' to the CL\'s description'))
 
   # Add all preview links that do not already exist in the description.
-  if len(docs_preview_links) > 0:
-    missing_preview_links = list(
-        set(docs_preview_links) - set(footers.get('Docs-Preview', [])))
-    if len(missing_preview_links) > 0:
+  if docs_preview_links:
+    missing_preview_links = docs_preview_links.difference(
+        footers.get('Docs-Preview', []))
+    if missing_preview_links:
       description_changed = True
-      for missing_link in missing_preview_links:
+      # Sorted so the footers are appended in a deterministic order.
+      for missing_link in sorted(missing_preview_links):
         change.AddDescriptionFooter('Docs-Preview', missing_link)
       results.append(
           output_api.PresubmitNotifyResult(